@@ -0,0 +1,75 @@
+# src/incept/cache.py
+
+import time
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache whose entries expire after a TTL.
+
+    Keys are tuples whose first element names the kind of resource, e.g.
+    ("page", page_id) or ("query", filter_key); the kind selects the TTL
+    from ttl_by_type (falling back to default_ttl). If maxsize is set, the
+    least recently used entry is evicted once the cache grows past it.
+    hits/misses counters are kept so the cache's effectiveness can be inspected.
+    """
+
+    def __init__(self, ttl_by_type: dict = None, default_ttl: float = 60, maxsize: int = None):
+        self.ttl_by_type = dict(ttl_by_type or {})
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _ttl(self, key):
+        return self.ttl_by_type.get(key[0], self.default_ttl)
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if time.monotonic() - stored_at < self._ttl(key):
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def get_or_set(self, key, factory):
+        """Return the cached value for key, calling factory() to fill it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_type(self, kind):
+        """Drop every entry of the given kind (e.g. all "query" results)."""
+        with self._lock:
+            for key in [k for k in self._data if k[0] == kind]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
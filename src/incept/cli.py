@@ -10,8 +10,6 @@ from pathlib import Path
 from incept.courses import getCourses, addCourses, addChapters, addLessons
 from incept.payload import build_payload
 
-from incept.dl_rebelway import download_rebelway, report_broken_sources
-
 # Set up user configuration directory
 CONFIG_DIR = Path.home() / ".incept"
 ENV_FILE = CONFIG_DIR / ".env"
@@ -73,7 +71,8 @@ def cli_init():
 @click.option("--api-key", default=None, help="Notion API Key. If not provided, uses .env or environment variable.")
 @click.option("--database-id", default=None, help="Notion Database ID. If not provided, uses .env or environment variable.")
 @click.option("--filter", default=None, help="Optional filter: name of course to fetch.")
-def cli_get_courses(api_key, database_id, filter):
+@click.option("--refresh", is_flag=True, help="Ignore cached data (e.g. the INCEPT_SNAPSHOT_TTL snapshot) and read from Notion.")
+def cli_get_courses(api_key, database_id, filter, refresh):
     """
     Fetch courses from the specified Notion database.
     If --api-key or --database-id are not passed, we try .env or system env vars.
@@ -100,7 +99,8 @@ def cli_get_courses(api_key, database_id, filter):
         db=db_type,
         api_key=api_key,
         database_id=database_id,
-        filter=filter
+        filter=filter,
+        refresh=refresh
     )
     if not courses or not courses.get("courses"):
         click.echo("No courses found.")
@@ -601,6 +601,9 @@ def cli_build_payload(
 @click.option("--chrome-port", default=9222, help="Chrome remote debug port.")
 def cli_dl_rebelway(excel_path, out_dir, skip_first, chrome_port, chapter_range):
     """Download SOURCE MP4s from Rebelway lessons.xlsx."""
+    # Imported here so pandas/selenium/bs4 only load for the download commands.
+    from incept.dl_rebelway import download_rebelway
+
     # parse the chapter_range flag into a (start,end) tuple
     range_tuple = None
     if chapter_range:
@@ -625,6 +628,8 @@ def cli_dl_rebelway(excel_path, out_dir, skip_first, chrome_port, chapter_range)
 @click.option("--chrome-port", default=9222, help="Chrome remote debug port.")
 def cli_report_broken(excel_path, out_csv, chrome_port):
     """Report lessons with missing SOURCE links to a CSV."""
+    from incept.dl_rebelway import report_broken_sources
+
     report_broken_sources(excel_path, out_csv, chrome_port)
 
 
@@ -3,6 +3,9 @@
 import os
 import re
 import copy
+import json
+import inspect
+import functools
 from pathlib import Path
 from incept.dbfactory import get_db_client
 from incept.utils import create_lessons, create_chapters, create_courses, expand_or_preserve_env_vars
@@ -11,24 +14,75 @@ DEFAULT_DB = "notion"
 CONFIG_DIR = Path.home() / ".incept"
 ENV_FILE = CONFIG_DIR / ".env"
 
+# getCourses results memoised with cache_result=True, keyed by (database_id, filter).
+_RESULT_CACHE = {}
 
-def getCourses(db=DEFAULT_DB, filter=None, **kwargs):
+
+def _invalidate_results(database_id):
+    """Forget memoised getCourses results for a database after it was written to."""
+    for key in [k for k in _RESULT_CACHE if k[0] == database_id]:
+        del _RESULT_CACHE[key]
+
+
+def with_db_client(fn):
+    """
+    Decorator for the public course functions: resolve the DB client once from
+    ``db`` (read from fn's own signature, positional or keyword) plus the
+    connection kwargs (api_key, database_id, ...) and pass it to ``fn`` as
+    ``db_client``. Callers that already hold a client can pass ``db_client=``
+    directly, which skips the lookup.
+    """
+    signature = inspect.signature(fn)
+    params = signature.parameters
+
+    @functools.wraps(fn)
+    def wrapper(*args, db_client=None, **kwargs):
+        own_kwargs = {k: kwargs.pop(k) for k in list(kwargs) if k in params}
+        if db_client is None:
+            db = signature.bind_partial(*args, **own_kwargs).arguments.get("db", DEFAULT_DB)
+            db_client = get_db_client(db, **kwargs)
+        return fn(*args, db_client=db_client, **own_kwargs)
+
+    return wrapper
+
+
+@with_db_client
+def getCourses(db=DEFAULT_DB, filter=None, cache_result=False, refresh=False, *, db_client):
     """
     Retrieve courses from the specified DB client.
     
     If a filter is provided (e.g., a course name), only matching courses
     and their children are fetched recursively.
+
+    If cache_result is True, the hierarchy is kept for the rest of the process
+    and later calls with the same database and filter return a copy of it
+    without touching the DB. addCourses/addChapters/addLessons invalidate it.
+
+    refresh=True bypasses every cache (the memoised result, the client's
+    in-memory cache and the on-disk snapshot) and reads fresh from the DB.
     
     Returns:
       dict: A nested dictionary (e.g. {"courses": [...]}) built using NotionDB.
     """
-    db_client = get_db_client(db, **kwargs)
-    if filter:
-        return db_client.get_courses(Name=filter)
+    # A dict filter is a complete query payload; it is keyed by its JSON form.
+    filter_key = json.dumps(filter, sort_keys=True) if isinstance(filter, dict) else filter
+    cache_key = (db_client.database_id, filter_key)
+    if cache_result and not refresh and cache_key in _RESULT_CACHE:
+        return copy.deepcopy(_RESULT_CACHE[cache_key])
+
+    if isinstance(filter, dict):
+        result = db_client.get_courses(name_filter=filter, refresh=refresh)
+    elif filter:
+        result = db_client.get_courses(name=filter, refresh=refresh)
     else:
-        return db_client.get_courses()
+        result = db_client.get_courses(refresh=refresh)
+
+    if cache_result:
+        _RESULT_CACHE[cache_key] = copy.deepcopy(result)
+    return result
 
-def addCourses(payload_data: dict, templates_dir: Path, db=DEFAULT_DB, include_video: bool = False, **kwargs):
+@with_db_client
+def addCourses(payload_data: dict, templates_dir: Path, db=DEFAULT_DB, include_video: bool = False, *, db_client):
     """
     Add one or more courses (including their chapters and lessons) to Notion.
     The payload_data is expected to follow your standard internal format, e.g.:
@@ -57,36 +111,39 @@ def addCourses(payload_data: dict, templates_dir: Path, db=DEFAULT_DB, include_v
         ]
       }
     Steps:
-      1) Fetch all existing courses from Notion (getCourses with no filter).
+      1) Look up which of the payload's course names already exist in Notion.
       2) For each course in payload_data["courses"]:
          a) Check if that course name already exists in Notion -> skip.
          b) Ensure "path" is defined (fallback to $COURSE_FOLDER_PATH or ~Documents).
          c) Call create_courses([thatCourse]) to build local folder structure (course/chapters/lessons).
-         d) Insert the course as a Notion page (no "parent_item" or a known workspace parent if you prefer).
-         e) Inline: for each new chapter, insert it as a sub-page; for each lesson in that chapter, insert it as a sub-sub-page.
-      3) Return the list of newly inserted courses (with updated 'id', etc.).
+         d) Queue the course (with its chapters and lessons) for insertion.
+      3) Insert all queued courses, then their chapters, then their lessons, as
+         Notion pages (each level concurrently), and return the newly inserted
+         courses (with updated 'id', etc.).
     """
-    db_client = get_db_client(db, **kwargs)
-
-    # 1) Fetch all existing courses from Notion (with no filter).
-    existing_hierarchy = getCourses(db=db, **kwargs)  # no filter => returns all courses
-    existing_courses = existing_hierarchy.get("courses", [])
-    existing_course_names = {c.get("name") for c in existing_courses if c.get("name")}
+    local_courses = payload_data.get("courses", [])
+    if isinstance(local_courses, dict):
+        local_courses = [local_courses]
 
-    # We'll store newly inserted courses in a list.
-    inserted_courses = []
+    # 1) Collect the names of courses that already exist in Notion.
+    if len(local_courses) == 1:
+        # Single course (the common CLI case): one page_size=1 query.
+        existing_course_names = set()
+        course_name = local_courses[0].get("name")
+        if course_name and db_client.course_exists(course_name):
+            existing_course_names.add(course_name)
+    else:
+        # Only look up the names in the payload instead of fetching the whole database.
+        existing_course_names = db_client.existing_course_names(c.get("name") for c in local_courses)
 
     # Define back/forward mappings for the "course" entity.
     course_back_mapping = db_client.back_mapping
     course_forward_mapping = db_client.forward_mapping
 
-    # Define minimal inline mappings for chapters & lessons.
-    chapter_back_mapping = db_client.back_mapping
-    chapter_forward_mapping = db_client.forward_mapping
-    lesson_back_mapping = db_client.back_mapping
-    lesson_forward_mapping = db_client.forward_mapping
+    # Courses that pass the checks below; inserted together once they are all prepared.
+    new_courses = []
 
-    def insert_lesson_inline(lesson_dict: dict, parent_chapter: dict):
+    def prepare_lesson_inline(lesson_dict: dict):
         # Carry the video flag into the lesson
         lesson_dict["video"] = include_video
         # Ensure video_path is set or NA
@@ -95,17 +152,8 @@ def addCourses(payload_data: dict, templates_dir: Path, db=DEFAULT_DB, include_v
         lesson_dict["type"] = ["Lesson"]
         # ensure every new lesson starts as "Not started"
         lesson_dict["status"] = lesson_dict.get("status", "Not started")
-        inserted_lesson = db_client.insert_page(
-            flat_object=lesson_dict,
-            back_mapping=lesson_back_mapping,
-            forward_mapping=lesson_forward_mapping,
-            parent_item=parent_chapter,
-            child_key="lessons"
-        )
-        lesson_dict["id"] = inserted_lesson.get("id")
-        return inserted_lesson
 
-    def insert_chapter_inline(chapter_dict: dict, parent_course: dict):
+    def prepare_chapter_inline(chapter_dict: dict):
         # Carry the video flag into the chapter
         chapter_dict["video"] = include_video
         # Ensure video_path is set or NA
@@ -114,27 +162,13 @@ def addCourses(payload_data: dict, templates_dir: Path, db=DEFAULT_DB, include_v
         chapter_dict["type"] = ["Chapter"]
         # ensure every new chapter starts as "Not started"
         chapter_dict["status"] = chapter_dict.get("status", "Not started")
-        inserted_chapter = db_client.insert_page(
-            flat_object=chapter_dict,
-            back_mapping=chapter_back_mapping,
-            forward_mapping=chapter_forward_mapping,
-            parent_item=parent_course,
-            child_key="chapters"
-        )
-        chapter_dict["id"] = inserted_chapter.get("id")
-        # If the chapter has lessons, insert them inline.
         lessons = chapter_dict.get("lessons", [])
         if isinstance(lessons, dict):
             lessons = [lessons]
         for lesson_dict in lessons:
-            insert_lesson_inline(lesson_dict, inserted_chapter)
-        return inserted_chapter
+            prepare_lesson_inline(lesson_dict)
 
     # 2) Loop over courses in payload_data["courses"].
-    local_courses = payload_data.get("courses", [])
-    if isinstance(local_courses, dict):
-        local_courses = [local_courses]
-
     for local_course in local_courses:
         course_name = local_course.get("name")
         if not course_name:
@@ -171,33 +205,39 @@ def addCourses(payload_data: dict, templates_dir: Path, db=DEFAULT_DB, include_v
 
         # 2d) Make sure the `video` flag is carried into Notion
         local_course["video"] = include_video
-        inserted_course = db_client.insert_page(
-            flat_object=local_course,
-            back_mapping=course_back_mapping,
-            forward_mapping=course_forward_mapping,
-            parent_item=None,  # or pass a workspace-level parent if your schema requires it
-            child_key="courses"
-        )
-        local_course["id"] = inserted_course.get("id")  # record the new ID
-        inserted_courses.append(inserted_course)
+        new_courses.append(local_course)
         existing_course_names.add(course_name)
 
-        # 2e) Now insert the chapters (and their lessons) inline.
+        # 2e) Prepare the chapters (and their lessons) for insertion.
         local_chapters = local_course.get("chapters", [])
         if isinstance(local_chapters, dict):
             local_chapters = [local_chapters]
         for local_chapter in local_chapters:
-            insert_chapter_inline(local_chapter, inserted_course)
+            prepare_chapter_inline(local_chapter)
+
+    # 3) Insert courses, then all their chapters, then all lessons; each level is
+    #    created concurrently, and every object gets its new Notion 'id'.
+    inserted_courses = db_client.insert_tree(
+        flat_objects=new_courses,
+        back_mapping=course_back_mapping,
+        forward_mapping=course_forward_mapping,
+        child_keys=("chapters", "lessons"),
+        parent_item=None  # or pass a workspace-level parent if your schema requires it
+    )
 
+    if inserted_courses:
+        _invalidate_results(db_client.database_id)
     return inserted_courses
 
 
+@with_db_client
 def addChapters(payload_data: dict,
                course_filter: str,
                templates_dir: Path,
                db=DEFAULT_DB,
                include_video: bool = False,
-               **kwargs):
+               *,
+               db_client):
     """
     Add one or more chapters (and optionally lessons) to a single course in Notion.
     The payload_data is expected to follow the standard internal format:
@@ -224,12 +264,10 @@ def addChapters(payload_data: dict,
       3) For each chapter in payload_data's "chapters":
          a) Check if it already exists by name in the Notion-fetched course -> skip if duplicate.
          b) Create local folders (via create_chapters).
-         c) Insert the new chapter as a Notion page (parent = the course).
-         d) If the chapter has lessons, insert them in-line.
+         c) Queue the new chapter (and its lessons) for insertion.
+         d) Insert the queued chapters (parent = the course), then their lessons.
       4) Return the list of newly inserted chapters (with updated 'id', 'path', etc.).
     """
-    db_client = get_db_client(db, **kwargs)
-
     # 1) Extract the first course from payload_data.
     try:
         local_course = payload_data["courses"][0]  # We'll handle the first course only.
@@ -242,7 +280,7 @@ def addChapters(payload_data: dict,
 
     # 2) Fetch the course from Notion using getCourses (with course_filter).
     #    We assume course_filter matches local_course_name (or something similar).
-    courses_hierarchy = getCourses(db=db, filter=course_filter, **kwargs)
+    courses_hierarchy = getCourses(filter=course_filter, db_client=db_client)
     if not courses_hierarchy or "courses" not in courses_hierarchy or not courses_hierarchy["courses"]:
         raise Exception(f"Course not found in Notion using filter='{course_filter}'.")
 
@@ -256,19 +294,15 @@ def addChapters(payload_data: dict,
     # Build a set of existing chapter names to detect duplicates quickly.
     existing_chapter_names = {ch.get("name") for ch in notion_course.get("chapters", []) if ch.get("name")}
 
-    # We store newly inserted chapters for returning later.
-    inserted_chapters = []
+    # Chapters that pass the checks below; inserted together once they are all prepared.
+    new_chapters = []
 
     # --- We'll define the back/forward mappings for 'chapter' insertion in Notion. ---
     chapter_back_mapping = db_client.back_mapping
     chapter_forward_mapping = db_client.forward_mapping
 
-    # --- We'll define minimal inline mappings for lessons. ---
-    lesson_back_mapping = db_client.back_mapping
-    lesson_forward_mapping = db_client.forward_mapping
-
-    # Inline helper to insert a lesson under a newly inserted chapter.
-    def insert_lesson_inline(lesson_dict: dict, parent_chapter: dict):
+    # Inline helper to prepare a lesson of a new chapter for insertion.
+    def prepare_lesson_inline(lesson_dict: dict):
         # Carry the video flag into the lesson
         lesson_dict["video"] = include_video
         # Ensure video_path is set or NA
@@ -276,16 +310,6 @@ def addChapters(payload_data: dict,
         # Ensure the lesson payload has the correct type.
         lesson_dict["type"] = ["Lesson"]
         lesson_dict["status"] = lesson_dict.get("status", "Not started")
-        inserted_lesson = db_client.insert_page(
-            flat_object=lesson_dict,
-            back_mapping=lesson_back_mapping,
-            forward_mapping=lesson_forward_mapping,
-            parent_item=parent_chapter,  # The newly inserted chapter is the parent.
-            child_key="lessons"
-        )
-        # Update local lesson's 'id'
-        lesson_dict["id"] = inserted_lesson.get("id")
-        return inserted_lesson
 
     # 3) Loop over local_course["chapters"] in the payload.
     local_chapters = local_course.get("chapters", [])
@@ -371,37 +395,37 @@ def addChapters(payload_data: dict,
         # 3c) Carry the video flag into chapter (if desired)
         chapter_payload["video"] = include_video
 
-        # 3d) Insert the new chapter as a Notion page.
-        inserted_chapter = db_client.insert_page(
-            flat_object=chapter_payload,
-            back_mapping=chapter_back_mapping,
-            forward_mapping=chapter_forward_mapping,
-            parent_item=notion_course,  # The Notion-fetched course is the parent.
-            child_key="chapters"
-        )
-        chapter_payload["id"] = inserted_chapter.get("id")  # Record the new ID.
-        inserted_chapters.append(inserted_chapter)
+        # 3d) Queue the new chapter (and its lessons) for insertion.
+        new_chapters.append(chapter_payload)
         existing_chapter_names.add(chapter_name)
 
-        # 3d) If the chapter has lessons, insert them inline.
         lessons = chapter_payload.get("lessons")
         if lessons:
             if isinstance(lessons, dict):
                 lessons = [lessons]
-            # before inserting lessons, ensure each one has video_path
-            if not include_video:
-                for ls in lessons:
-                    ls["video_path"] = "NA"
-
             for lesson_dict in lessons:
-                insert_lesson_inline(lesson_dict, inserted_chapter)
+                prepare_lesson_inline(lesson_dict)
+
+    # 3e) Insert the new chapters, then all of their lessons, as Notion pages
+    #     (each level concurrently); the Notion-fetched course is the parent.
+    inserted_chapters = db_client.insert_tree(
+        flat_objects=new_chapters,
+        back_mapping=chapter_back_mapping,
+        forward_mapping=chapter_forward_mapping,
+        child_keys=("lessons",),
+        parent_item=notion_course
+    )
+
+    if inserted_chapters:
+        _invalidate_results(db_client.database_id)
 
     # 4) Return the newly inserted chapters.
     return inserted_chapters
 
+@with_db_client
 def addLessons(lesson_payload: dict, *, course_obj: dict | None = None,
                course_filter: str | None = None, templates_dir: Path,
-               db=DEFAULT_DB, include_video: bool = False, **kwargs):
+               db=DEFAULT_DB, include_video: bool = False, db_client):
     """
     Add a lesson to a course in Notion.
     
@@ -419,7 +443,7 @@ def addLessons(lesson_payload: dict, *, course_obj: dict | None = None,
     if course_obj is None:
         if course_filter is None:
             raise ValueError("Need either course_obj or course_filter")
-        course_obj = getCourses(db=db, filter=course_filter, **kwargs)["courses"][0]
+        course_obj = getCourses(filter=course_filter, db_client=db_client)["courses"][0]
     course = course_obj
     
     # 2. Identify the target chapter.
@@ -488,9 +512,7 @@ def addLessons(lesson_payload: dict, *, course_obj: dict | None = None,
     else:
         lesson_payload["video_path"] = "NA"
     
-    # 6. Insert the lesson into Notion.
-    # Get the DB client (assumed to be an instance of NotionDB) with its loaded mappings.
-    db_client = get_db_client(db, **kwargs)
+    # 6. Insert the lesson into Notion using the DB client's loaded mappings.
     inserted_lesson = db_client.insert_page(
         flat_object=lesson_payload,
         back_mapping=db_client.back_mapping,       # Use default back mapping
@@ -498,13 +520,14 @@ def addLessons(lesson_payload: dict, *, course_obj: dict | None = None,
         parent_item=target_chapter,                    # Use target chapter as parent
         child_key="lessons"
     )
+    _invalidate_results(db_client.database_id)
     
     # 7. Return the inserted lesson.
     return inserted_lesson
     
 
 if __name__ == "__main__":
-    import os, json
+    import os
     from pathlib import Path
     from dotenv import load_dotenv
 
@@ -1,8 +1,17 @@
 # src/incept/dbfactory.py
 
+from functools import lru_cache
 from incept.notiondb import NotionDB
 # from incept.databases.postgres import PostgresDB  # hypothetical future class
 
+@lru_cache(maxsize=16)
+def _make_notion(api_key, database_id):
+    """
+    Build (once) the NotionDB client for an (api_key, database_id) pair, so
+    repeated calls share one client and its warm connection pool.
+    """
+    return NotionDB(api_key, database_id)
+
 def get_db_client(db_type, **kwargs):
     """
     Factory function that returns the appropriate DB client.
@@ -13,7 +22,7 @@ def get_db_client(db_type, **kwargs):
     if db_type == "notion":
         api_key = kwargs["api_key"]
         database_id = kwargs["database_id"]
-        return NotionDB(api_key, database_id)
+        return _make_notion(api_key, database_id)
 
     elif db_type == "postgres":
         # Example: psql_conn_str = kwargs["conn_str"]
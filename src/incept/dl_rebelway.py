@@ -2,21 +2,59 @@
 import os
 import html
 import re
-import pandas as pd
+import requests
 
+from collections                 import deque
+from concurrent.futures          import ThreadPoolExecutor
+from itertools                   import islice
 from urllib.parse                import urlsplit
 from bs4                         import BeautifulSoup
-from selenium.common.exceptions import InvalidSessionIdException
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
 
 from .dl_video import (
     launch_chrome,
     make_chrome_driver,
     make_download_session,
     download_stream,
+    RANGED_DOWNLOAD_PARTS,
 )
 
+# Lesson videos streamed at once while Selenium resolves the next lesson page.
+MAX_PARALLEL_DOWNLOADS = 4
+# Lesson pages fetched ahead over plain HTTP (see fetch_source_url).
+MAX_PARALLEL_PAGE_FETCHES = 8
+# Connections the shared session uses at once: every download may be split
+# into RANGED_DOWNLOAD_PARTS byte ranges, next to the page prefetches.
+DOWNLOAD_POOL_SIZE = MAX_PARALLEL_DOWNLOADS * RANGED_DOWNLOAD_PARTS + MAX_PARALLEL_PAGE_FETCHES
+
+def _download_lesson(sess, src_url: str, dest: str, referer: str) -> None:
+    """Download one lesson video in a worker thread, reporting the outcome."""
+    try:
+        # Vimeo needs Referer (per request, since the session is shared)
+        download_stream(sess, src_url, dest, headers={"Referer": referer})
+        print(f"✔  Saved → {dest}")
+    except Exception as e:
+        print(f"❌  Failed {os.path.basename(dest)} → {e}")
+
+# Anything that is not a letter, digit or whitespace becomes "_" in file slugs.
+_SLUG_INVALID_RE = re.compile(r"[^\w\s]")
+
+_SELECT_RE = re.compile(
+    r'<select\b[^>]*\bclass="[^"]*\bvideo-download-selector\b[^"]*"[^>]*>(.*?)</select>',
+    re.S | re.I,
+)
+_OPTION_RE = re.compile(r'<option\b[^>]*\bvalue="([^"]*)"[^>]*>(.*?)</option>', re.S | re.I)
+
 def find_source_url(html_text: str) -> str | None:
     """Return the VIDEO SOURCE URL from Rebelway’s download <select>, or None."""
+    # Fast path: scan just the <select> with regexes instead of building a full tree.
+    match = _SELECT_RE.search(html_text)
+    if match:
+        for value, label in _OPTION_RE.findall(match.group(1)):
+            if "source" in html.unescape(label).lower():
+                return html.unescape(value)
+
+    # Unusual markup (or no SOURCE option): let BeautifulSoup have the final say.
     soup = BeautifulSoup(html_text, "html.parser")
     sel  = soup.select_one("select.video-download-selector")
     if not sel:
@@ -26,6 +64,60 @@ def find_source_url(html_text: str) -> str | None:
             return html.unescape(opt["value"])
     return None
 
+# Same lookup as find_source_url, run inside the browser against the live DOM.
+_SOURCE_URL_JS = """
+var sel = document.querySelector('select.video-download-selector');
+if (!sel) return null;
+for (const opt of sel.options) {
+    if (opt.textContent.toLowerCase().includes('source')) return opt.value;
+}
+return null;
+"""
+
+def find_source_url_in_driver(driver) -> str | None:
+    """
+    Return the VIDEO SOURCE URL from the page loaded in `driver`, or None.
+    Queries the DOM via execute_script instead of serialising and parsing
+    page_source; falls back to find_source_url if the script fails.
+    """
+    try:
+        url = driver.execute_script(_SOURCE_URL_JS)
+    except WebDriverException:
+        return find_source_url(driver.page_source)
+    return html.unescape(url) if url else None
+
+# Columns of the 'lessons' sheet used by the downloaders; others are never loaded.
+LESSON_COLUMNS = ("chapter_index", "name", "link")
+
+def _read_lessons(excel_path: str):
+    """Read the 'lessons' sheet, parsing only LESSON_COLUMNS with fixed dtypes."""
+    # pandas is only needed here, so keep it off the module import path.
+    import pandas as pd
+
+    df = pd.read_excel(
+        excel_path,
+        sheet_name="lessons",
+        engine="openpyxl",
+        usecols=lambda col: col in LESSON_COLUMNS,
+        dtype={"name": str, "link": str},
+    )
+    if not set(LESSON_COLUMNS).issubset(df.columns):
+        raise ValueError("Excel must have columns: chapter_index, name, link")
+    return df
+
+def fetch_source_url(sess, lesson_url: str) -> str | None:
+    """
+    Try to read the VIDEO SOURCE URL with a plain GET through the cookie-carrying
+    download session, without driving Chrome. Returns None if the request fails
+    or the page needs JavaScript to render the <select>.
+    """
+    try:
+        resp = sess.get(lesson_url, timeout=(10, 30))
+        resp.raise_for_status()
+    except requests.RequestException:
+        return None
+    return find_source_url(resp.text)
+
 def download_rebelway(
     excel_path: str,
     out_dir:    str,
@@ -41,10 +133,7 @@ def download_rebelway(
     launch_chrome(debug_port=chrome_port)
 
     # 2) Read Excel
-    df = pd.read_excel(excel_path, sheet_name="lessons", engine="openpyxl")
-    if not {"chapter_index","name","link"}.issubset(df.columns):
-        raise ValueError("Excel must have columns: chapter_index, name, link")
-
+    df = _read_lessons(excel_path)
 
     # 2a) filter to the requested chapter(s)
     if chapter_range:
@@ -56,70 +145,80 @@ def download_rebelway(
 
     # 3) Prepare Selenium + requests
     driver = make_chrome_driver(debug_port=chrome_port)
-    sess   = make_download_session()
+    sess   = make_download_session(pool_maxsize=DOWNLOAD_POOL_SIZE)
     os.makedirs(out_dir, exist_ok=True)
 
-    # 4) Seed episode counters
-    ep = {}
-    for row in df.iloc[:skip_first].itertuples():
-        c = int(row.chapter_index)
-        ep[c] = ep.get(c, 0) + 1
+    # 4) Number episodes within each chapter in sheet order (broken rows count
+    #    too), then drop the rows that were already handled.
+    df = df.assign(episode=df.groupby("chapter_index").cumcount() + 1)
+    df = df[df.index >= skip_first]
 
-    # 5) Loop & download
-    for idx, row in df.iterrows():
-        if idx < skip_first:
-            continue
+    # 5) Loop & download: lesson pages are first fetched ahead over plain HTTP,
+    #    at most MAX_PARALLEL_PAGE_FETCHES ahead of the loop; only pages where
+    #    that finds no SOURCE are loaded (serially) in Chrome. The video
+    #    downloads run in a small thread pool.
+    pool      = ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS)
+    page_pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL_PAGE_FETCHES)
+    links      = iter(df["link"])
+    prefetched = deque(
+        page_pool.submit(fetch_source_url, sess, link)
+        for link in islice(links, MAX_PARALLEL_PAGE_FETCHES)
+    )
+    try:
+        rows = df[[*LESSON_COLUMNS, "episode"]].itertuples(index=True, name=None)
+        for idx, chapter_index, name, lesson, episode in rows:
+            prefetch = prefetched.popleft()
+            next_link = next(links, None)
+            if next_link is not None:
+                prefetched.append(page_pool.submit(fetch_source_url, sess, next_link))
 
-        chap   = int(row["chapter_index"])
-        title  = str(row["name"])
-        lesson = row["link"]
+            chap   = int(chapter_index)
+            title  = str(name)
+            season = chap
 
-        # increment count for this chapter, even on broken
-        ep.setdefault(chap, 0)
-        ep[chap] += 1
-        season, episode = chap, ep[chap]
+            # generate slug
+            slug = _SLUG_INVALID_RE.sub("_", title.lower()).strip().replace(" ", "_")
 
-        # generate slug
-        slug = "".join(
-            ch.lower() if ch.isalnum() or ch.isspace() else "_" 
-            for ch in title
-        ).strip().replace(" ", "_")
+            print(f"\n➡️  [{idx+1}] {lesson} → s{season:02d}e{episode:02d}_{slug}.mp4")
 
-        print(f"\n➡️  [{idx+1}] {lesson} → s{season:02d}e{episode:02d}_{slug}.mp4")
+            src_url = prefetch.result()
+            if not src_url:
+                # load page in Chrome (restart on session death)
+                try:
+                    driver.get(lesson)
+                except InvalidSessionIdException:
+                    driver.quit()
+                    driver = make_chrome_driver(debug_port=chrome_port)
+                    driver.get(lesson)
 
-        # load page (restart on session death)
-        try:
-            driver.get(lesson)
-        except InvalidSessionIdException:
-            driver.quit()
-            driver = make_chrome_driver(debug_port=chrome_port)
-            driver.get(lesson)
+                driver.implicitly_wait(3)
+                src_url = find_source_url_in_driver(driver)
+            if not src_url:
+                print(f"⚠️  No SOURCE found for s{season:02d}e{episode:02d}")
+                continue
 
-        driver.implicitly_wait(3)
-        html_body = driver.page_source
-        src_url   = find_source_url(html_body)
-        if not src_url:
-            print(f"⚠️  No SOURCE found for s{season:02d}e{episode:02d}")
-            continue
-
-        ext   = os.path.splitext(urlsplit(src_url).path)[1] or ".mp4"
-        fname = f"s{season:02d}e{episode:02d}_{slug}{ext}"
-        dest  = os.path.join(out_dir, fname)
-
-        if os.path.exists(dest):
-            print(f"⏭  Already downloaded: {fname}")
-            continue
-
-        # Vimeo needs Referer
-        sess.headers["Referer"] = lesson
-        print(f"↓ Downloading: {fname}")
-        try:
-            download_stream(sess, src_url, dest)
-            print(f"✔  Saved → {dest}")
-        except Exception as e:
-            print(f"❌  Failed → {e}")
+            ext   = os.path.splitext(urlsplit(src_url).path)[1] or ".mp4"
+            fname = f"s{season:02d}e{episode:02d}_{slug}{ext}"
+            dest  = os.path.join(out_dir, fname)
+
+            if os.path.exists(dest):
+                print(f"⏭  Already downloaded: {fname}")
+                continue
+
+            print(f"↓ Downloading: {fname}")
+            pool.submit(_download_lesson, sess, src_url, dest, lesson)
+    except BaseException:
+        # Ctrl-C or an error: drop queued page fetches and downloads instead of
+        # working through them (transfers already running still finish).
+        page_pool.shutdown(wait=False, cancel_futures=True)
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    else:
+        page_pool.shutdown()
+        pool.shutdown()  # wait for the remaining downloads
+    finally:
+        driver.quit()
 
-    driver.quit()
     print("\n🎉 All done.")
 
 def report_broken_sources(
@@ -131,17 +230,17 @@ def report_broken_sources(
     Scan every lesson for a missing SOURCE option.
     Write rows (with chapter_index, name, link) to out_csv.
     """
+    import pandas as pd
+
     launch_chrome(debug_port=chrome_port)
 
-    df = pd.read_excel(excel_path, sheet_name="lessons", engine="openpyxl")
-    if not {"chapter_index","name","link"}.issubset(df.columns):
-        raise ValueError("Excel must have columns: chapter_index, name, link")
+    df = _read_lessons(excel_path)
 
     driver = make_chrome_driver(debug_port=chrome_port)
     broken = []
 
-    for idx, row in df.iterrows():
-        url = row.link
+    rows = df[list(LESSON_COLUMNS)].itertuples(index=True, name=None)
+    for idx, chapter_index, name, url in rows:
         try:
             driver.get(url)
         except InvalidSessionIdException:
@@ -150,12 +249,12 @@ def report_broken_sources(
             driver.get(url)
         driver.implicitly_wait(3)
 
-        if not find_source_url(driver.page_source):
+        if not find_source_url_in_driver(driver):
             broken.append({
                 "row": idx+2,
-                "chapter_index": row.chapter_index,
-                "name": row.name,
-                "link": row.link
+                "chapter_index": chapter_index,
+                "name": name,
+                "link": url
             })
             print(f"❌ Row {idx+2}: No SOURCE → {url}")
 
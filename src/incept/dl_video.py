@@ -1,9 +1,13 @@
 # src/incept/dl_video.py
 import os
+import sys
+import shutil
 import subprocess
 import browser_cookie3
 import requests
 
+from concurrent.futures              import ThreadPoolExecutor
+from functools                       import lru_cache
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -11,6 +15,11 @@ from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 from webdriver_manager.chrome import ChromeDriverManager
 
+# Files at least this large are fetched as parallel byte ranges when the server
+# supports it (CDNs tend to throttle each connection separately).
+RANGED_DOWNLOAD_MIN_SIZE = 32 * 1024 * 1024
+RANGED_DOWNLOAD_PARTS    = 4
+
 def launch_chrome(debug_port: int = 9222) -> None:
     """
     Fire up (or re-fire) Google Chrome in remote-debugging mode.
@@ -28,6 +37,14 @@ def launch_chrome(debug_port: int = 9222) -> None:
     subprocess.Popen(cmd)
     input(f"\n🚀 Chrome launched on port {debug_port}.  Log in, then press ENTER to continue…")
 
+@lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """
+    Path to the chromedriver binary: $CHROMEDRIVER if set, otherwise resolved
+    (and possibly downloaded) once per process by webdriver-manager.
+    """
+    return os.environ.get("CHROMEDRIVER") or ChromeDriverManager().install()
+
 def make_chrome_driver(debug_port: int = 9222, headless: bool = False):
     """
     Return a Selenium WebDriver attached to the already-running Chrome.
@@ -37,19 +54,51 @@ def make_chrome_driver(debug_port: int = 9222, headless: bool = False):
     if headless:
         opts.add_argument("--headless=new")
     opts.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
-    svc = Service(ChromeDriverManager().install())
+    svc = Service(_chromedriver_path())
     return webdriver.Chrome(service=svc, options=opts)
 
+def _chrome_cookie_file() -> str | None:
+    """Return the default Chrome profile's cookie DB, if it can be found."""
+    if sys.platform == "darwin":
+        profile = os.path.expanduser("~/Library/Application Support/Google/Chrome/Default")
+    elif sys.platform.startswith("win"):
+        profile = os.path.join(os.environ.get("LOCALAPPDATA", ""), "Google", "Chrome", "User Data", "Default")
+    else:
+        profile = os.path.expanduser("~/.config/google-chrome/Default")
+    for candidate in (os.path.join(profile, "Network", "Cookies"), os.path.join(profile, "Cookies")):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+@lru_cache(maxsize=1)
+def _load_chrome_cookies(cookie_file: str, mtime: float):
+    """Decrypt Chrome's cookies; cached until the cookie DB's mtime changes."""
+    return browser_cookie3.chrome(cookie_file=cookie_file)
+
+def chrome_cookies():
+    """
+    Return Chrome's cookie jar, re-reading (and decrypting) the cookie DB only
+    when Chrome has written to it since the last call.
+    """
+    cookie_file = _chrome_cookie_file()
+    if cookie_file is None:
+        return browser_cookie3.chrome()
+    return _load_chrome_cookies(cookie_file, os.stat(cookie_file).st_mtime)
+
 def make_download_session(
     retries: int = 5,
     backoff_factor: float = 1.0,
-    status_forcelist=(429, 500, 502, 503, 504)
+    status_forcelist=(429, 500, 502, 503, 504),
+    pool_maxsize: int = RANGED_DOWNLOAD_PARTS
 ):
     """
     Return a requests.Session that reuses your Chrome cookies
     and auto-retries on common transient failures.
+    `pool_maxsize` should cover the connections used at once (one per byte
+    range of each concurrent download, plus any other parallel requests);
+    beyond that urllib3 discards keep-alive connections.
     """
-    cj = browser_cookie3.chrome()
+    cj = chrome_cookies()
     sess = requests.Session()
     sess.cookies.update(cj)
 
@@ -59,7 +108,7 @@ def make_download_session(
         status_forcelist=status_forcelist,
         allowed_methods=["GET"]
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_maxsize=pool_maxsize)
     sess.mount("https://", adapter)
     sess.mount("http://", adapter)
     return sess
@@ -69,15 +118,123 @@ def download_stream(
     url: str,
     dest_path: str,
     timeout_connect: int = 10,
-    timeout_read:    int = 300
+    timeout_read:    int = 300,
+    headers: dict | None = None
 ):
     """
-    Stream a file from `url` down to `dest_path`, in 1 MiB chunks.
+    Stream a file from `url` down to `dest_path`, copying the raw response in
+    4 MiB blocks with shutil.copyfileobj.
+    Extra request `headers` (e.g. a Referer) apply to this request only.
+
+    Large files on servers that accept byte ranges are downloaded as
+    RANGED_DOWNLOAD_PARTS parallel range requests instead; if that fails,
+    the single-stream download is used.
+
+    Data is written to `dest_path` + ".part", which is renamed onto `dest_path`
+    only once the download is complete and removed if it fails, so a
+    preallocated but unfinished file never passes for a finished download.
+    """
+    timeout = (timeout_connect, timeout_read)
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    part_path = dest_path + ".part"
+    try:
+        size = _ranged_size(session, url, headers, timeout)
+        if size is not None and size >= RANGED_DOWNLOAD_MIN_SIZE:
+            try:
+                _download_ranged(session, url, part_path, size, headers, timeout)
+            except (requests.RequestException, OSError) as e:
+                print(f"⚠️  Ranged download failed ({e}); retrying as a single stream")
+            else:
+                os.replace(part_path, dest_path)
+                return
+        _download_single(session, url, part_path, headers, timeout)
+        os.replace(part_path, dest_path)
+    except BaseException:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+
+
+def _download_single(session, url, path, headers, timeout):
+    """Download `url` to `path` as one stream, checking the size against Content-Length."""
+    with session.get(url, stream=True, timeout=timeout, headers=headers) as r:
+        r.raise_for_status()
+        # let urllib3 undo any gzip/deflate transfer encoding while reading raw
+        r.raw.decode_content = True
+        # Content-Length is the on-disk size only for unencoded bodies
+        expected = None if r.headers.get("Content-Encoding") else r.headers.get("Content-Length")
+        expected = int(expected) if expected and expected.isdigit() else None
+        with open(path, "wb") as f:
+            if expected:
+                _preallocate(f.fileno(), expected)
+            shutil.copyfileobj(r.raw, f, length=4*1024*1024)
+            if expected and f.tell() != expected:
+                raise OSError(f"incomplete download: got {f.tell()} of {expected} bytes")
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """
+    Reserve `size` bytes for `fd` up front (one contiguous allocation instead of
+    growing the file as data streams in); falls back to a sparse resize where
+    posix_fallocate is unavailable (e.g. macOS) or unsupported by the filesystem.
     """
-    with session.get(url, stream=True, timeout=(timeout_connect, timeout_read)) as r:
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass
+    os.ftruncate(fd, size)
+
+def _ranged_size(session: requests.Session, url: str, headers: dict | None, timeout) -> int | None:
+    """
+    Return the Content-Length of `url` if the server accepts byte-range requests
+    for it (and positional writes are available), else None.
+    """
+    if not hasattr(os, "pwrite"):
+        return None
+    try:
+        r = session.head(url, allow_redirects=True, timeout=timeout, headers=headers)
         r.raise_for_status()
-        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-        with open(dest_path, "wb") as f:
-            for chunk in r.iter_content(1024*1024):
-                if chunk:
-                    f.write(chunk)
+    except requests.RequestException:
+        return None
+    # ranges address the encoded bytes, so only plain bodies can be stitched together
+    if r.headers.get("Accept-Ranges", "").lower() != "bytes" or r.headers.get("Content-Encoding"):
+        return None
+    try:
+        return int(r.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+def _download_range(session, url, fd, start, end, headers, timeout):
+    """Fetch bytes [start, end] of `url` and write them at the same offset of `fd`."""
+    range_headers = {**(headers or {}), "Range": f"bytes={start}-{end}"}
+    with session.get(url, stream=True, timeout=timeout, headers=range_headers) as r:
+        r.raise_for_status()
+        if r.status_code != 206:
+            raise requests.HTTPError(f"server ignored the Range header (HTTP {r.status_code})", response=r)
+        offset = start
+        for chunk in r.iter_content(1024*1024):
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+    if offset != end + 1:
+        raise OSError(f"short read for bytes {start}-{end}")
+
+def _download_ranged(session, url, dest_path, size, headers, timeout):
+    """Download `size` bytes of `url` to `dest_path` as parallel byte ranges."""
+    part = -(-size // RANGED_DOWNLOAD_PARTS)  # ceil division
+    ranges = [(lo, min(lo + part, size) - 1) for lo in range(0, size, part)]
+    fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        _preallocate(fd, size)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [
+                pool.submit(_download_range, session, url, fd, lo, hi, headers, timeout)
+                for lo, hi in ranges
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        os.close(fd)
@@ -2,15 +2,55 @@
 
 import os
 import json
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from platformdirs import user_cache_dir
+from notionmanager.api import NotionAPI
 from notionmanager.notion import NotionManager
+from incept.cache import TTLCache
+
+try:  # optional speedup: pip install incept[speedups]
+    import orjson
+except ImportError:
+    orjson = None
+
+# Upper bound on Notion requests in flight, per thread pool and (see _IN_FLIGHT)
+# across all NotionDB clients, so nested pools cannot stack up.
+MAX_CONCURRENT_REQUESTS = 8
+
+# Notion caps the number of conditions in a compound filter at 100.
+MAX_FILTER_CONDITIONS = 100
+
+# Notion allows ~3 requests/s per integration, so page creation is capped lower.
+MAX_CONCURRENT_WRITES = 3
+
+# How often a rate-limited (HTTP 429) write is retried after waiting Retry-After.
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Notion's documented average rate limit per integration; requests beyond it
+# are answered with HTTP 429.
+NOTION_REQUESTS_PER_SECOND = 3
+
+# Seconds that fetched pages / database query results stay in NotionDB's cache.
+CACHE_TTL_BY_TYPE = {"page": 300, "query": 60}
+# Upper bound on cached entries; the least recently used are evicted first.
+CACHE_MAXSIZE = 4096
+
+# Opt-in on-disk snapshot of the full database: set this to a TTL in seconds.
+SNAPSHOT_TTL_ENV = "INCEPT_SNAPSHOT_TTL"
 
 # Default mapping file location
 mapping_file_path = Path.home() / ".incept" / "mapping" / "notion_mapping.json"
 
 if mapping_file_path.exists():
-    with open(mapping_file_path, 'r') as f:
-        mapping = json.load(f)
+    mapping = (orjson.loads if orjson is not None else json.loads)(mapping_file_path.read_bytes())
     forward_mapping = mapping.get("forward_mapping", {})
     back_mapping = mapping.get("back_mapping", {})
     hierarchy_config = mapping.get("hierarchy_config", {})
@@ -64,16 +104,183 @@ else:
 
 
 
+def _name_condition(name):
+    """Notion filter condition matching pages whose "Name" title equals name."""
+    return {"property": "Name", "title": {"equals": name}}
+
+
+def _iter_relation_ids(properties, relation_property):
+    """
+    Helper to yield the relation IDs of a given Notion property; nothing is
+    allocated for pages without relations (e.g. leaf lessons).
+    """
+    try:
+        relations = properties[relation_property]["relation"]
+    except (KeyError, TypeError):
+        return
+    for rel in relations or ():
+        yield rel["id"]
+
+
+def _extract_title(properties, title_property="Name"):
+    """Helper to extract the plain-text title from a given Notion property."""
+    title = properties.get(title_property, {}).get("title", [])
+    return "".join(t.get("plain_text", "") for t in title)
+
+
+def _snapshot_path(database_id):
+    """Location of the on-disk snapshot of all pages of database_id."""
+    return Path(user_cache_dir("incept")) / f"notion-{database_id}.json"
+
+
+def _parent_relation(parent_id):
+    """Return the "Parent item" relation property pointing at parent_id."""
+    return {"type": "relation", "relation": [{"id": parent_id}], "has_more": False}
+
+
+def _snapshot_ttl_from_env():
+    """Snapshot TTL in seconds from $INCEPT_SNAPSHOT_TTL; unset or invalid disables it."""
+    raw = os.environ.get(SNAPSHOT_TTL_ENV)
+    if not raw:
+        return 0
+    try:
+        return max(float(raw), 0)
+    except ValueError:
+        print(f"Warning: ignoring invalid {SNAPSHOT_TTL_ENV}={raw!r} (expected seconds)")
+        return 0
+
+
+def _first_set(*values):
+    """Return the first truthy value (used for icon/cover fallbacks)."""
+    return next((v for v in values if v), None)
+
+
+def _make_session():
+    """
+    Return a requests.Session with a keep-alive connection pool for api.notion.com,
+    sized for the concurrent tree fetches, and retries for transient GET failures.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=["GET"]
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+def _retry_after(response, attempt):
+    """Seconds to wait before retrying a 429: Retry-After if given, else exponential with jitter."""
+    try:
+        return max(float(response.headers.get("Retry-After", "")), 0)
+    except ValueError:
+        return 0.5 * 2 ** attempt + random.uniform(0, 0.5)
+
+
+
+class _RateLimiter:
+    """
+    Sliding-window rate limiter: at most `rate` calls to acquire() return in any
+    `per`-second window. Waiting callers queue on the lock, oldest first.
+    """
+
+    def __init__(self, rate, per=1.0):
+        self.rate = rate
+        self.per = per
+        self._starts = deque(maxlen=rate)
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if len(self._starts) == self.rate:
+                wait = self._starts[0] + self.per - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            self._starts.append(time.monotonic())
+
+
+# Shared by every NotionDB so warm connections are reused across clients, and
+# the concurrency and rate limits apply to the integration as a whole.
+_SESSION = _make_session()
+_IN_FLIGHT = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_RATE_LIMITER = _RateLimiter(NOTION_REQUESTS_PER_SECOND)
+
+
+class _PooledNotionAPI(NotionAPI):
+    """
+    NotionAPI variant that sends every request through a shared requests.Session
+    instead of the module-level requests.get/post calls, so TCP/TLS connections
+    to Notion are kept alive and reused.
+    """
+
+    def __init__(self, api_key, session=None, version="2022-06-28"):
+        super().__init__(api_key, version=version)
+        self.session = session or _SESSION
+
+    def _request(self, method, path, payload=None):
+        if payload is not None and orjson is not None:
+            # Serialise the body ourselves; orjson is several times faster than json.
+            body = {"data": orjson.dumps(payload)}
+        else:
+            body = {"json": payload}
+        # Requests are paced to NOTION_REQUESTS_PER_SECOND; a 429 should then be
+        # rare. GETs are retried by the session's adapter. A 429 means Notion
+        # rejected the request outright, so POST/PATCH can safely be resent after
+        # Retry-After. The in-flight slot is released while backing off.
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            _RATE_LIMITER.acquire()
+            with _IN_FLIGHT:
+                response = self.session.request(method, self.BASE_URL + path, headers=self.headers, **body)
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            time.sleep(_retry_after(response, attempt))
+        response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
+    def query_database(self, database_id, payload=None):
+        return self._request("POST", f"databases/{database_id}/query", payload or {})
+
+    def create_page(self, payload):
+        return self._request("POST", "pages", payload)
+
+    def update_page(self, page_id, payload):
+        return self._request("PATCH", f"pages/{page_id}", payload)
+
+    def get_database(self, database_id):
+        return self._request("GET", f"databases/{database_id}")
+
+    def get_page(self, page_id):
+        return self._request("GET", f"pages/{page_id}")
+
+
 class NotionDB:
 
-    def __init__(self, api_key, database_id, mapping_config: dict = None):
+    __slots__ = ("notion", "database_id", "_cache", "_snapshot_ttl",
+                 "forward_mapping", "back_mapping", "hierarchy_config")
+
+    def __init__(self, api_key, database_id, mapping_config: dict = None, snapshot_ttl: float = None):
         """
         Wrapper around NotionManager for handling Notion database interactions.
         Optionally accepts a mapping_config dict. If not provided, the fallback/global
         forward_mapping, back_mapping, and hierarchy_config will be used.
+
+        snapshot_ttl (seconds, default from $INCEPT_SNAPSHOT_TTL) enables an on-disk
+        snapshot of the full database that unfiltered get_courses() calls read
+        from while it is fresh; writes delete it.
         """
         self.notion = NotionManager(api_key, database_id)
+        # Route all API calls through the shared keep-alive session.
+        self.notion.api = _PooledNotionAPI(api_key)
         self.database_id = database_id
+        # Read-through cache for pages and query results; writes invalidate it.
+        self._cache = TTLCache(ttl_by_type=CACHE_TTL_BY_TYPE, maxsize=CACHE_MAXSIZE)
+        if snapshot_ttl is None:
+            snapshot_ttl = _snapshot_ttl_from_env()
+        self._snapshot_ttl = snapshot_ttl
 
         if mapping_config:
             self.forward_mapping = mapping_config.get("forward_mapping", forward_mapping)
@@ -84,22 +291,203 @@ class NotionDB:
             self.back_mapping = back_mapping
             self.hierarchy_config = hierarchy_config
 
-    def _extract_relation(self, properties, relation_property):
+    def _get_page(self, page_id):
+        """Fetch a single page, served from the TTL cache when possible."""
+        return self._cache.get_or_set(("page", page_id), lambda: self.notion.get_page(page_id))
+
+    def _get_pages(self, **kwargs):
+        """Run a database query (see NotionManager.get_pages), cached by its arguments."""
+        key = ("query", json.dumps(kwargs, sort_keys=True))
+        return self._cache.get_or_set(key, lambda: self.notion.get_pages(**kwargs))
+
+    def _load_snapshot(self):
+        """Return the pages from a fresh on-disk snapshot, or None."""
+        if not self._snapshot_ttl:
+            return None
+        path = _snapshot_path(self.database_id)
+        try:
+            if time.time() - path.stat().st_mtime >= self._snapshot_ttl:
+                return None
+            data = path.read_bytes()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return None
+
+    def _save_snapshot(self, pages):
+        if not self._snapshot_ttl:
+            return
+        path = _snapshot_path(self.database_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            if orjson is not None:
+                tmp_path.write_bytes(orjson.dumps(pages))
+            else:
+                tmp_path.write_text(json.dumps(pages), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            print(f"Warning: could not write Notion snapshot {path}: {e}")
+
+    def _get_all_pages(self):
+        """Every page in the database: from memory, then the on-disk snapshot, then Notion."""
+        def fetch():
+            pages = self._load_snapshot()
+            if pages is None:
+                pages = self.notion.get_pages(retrieve_all=True)
+                self._save_snapshot(pages)
+            return pages
+        return self._cache.get_or_set(("query", "all"), fetch)
+
+    def _iter_pages(self, page_size=100, **kwargs):
         """
-        Helper to extract a list of relation IDs from a given Notion property.
+        Yield pages of a database query one at a time, following next_cursor
+        lazily so callers that stop early never request the remaining pages.
         """
-        relation = properties.get(relation_property, {})
-        if relation and "relation" in relation:
-            return [rel.get("id") for rel in relation["relation"]]
-        return []
+        payload = {"page_size": page_size, **kwargs}
+        while True:
+            response = self.notion.api.query_database(self.database_id, payload)
+            yield from response.get("results", [])
+            if not response.get("has_more"):
+                return
+            payload["start_cursor"] = response.get("next_cursor")
 
-    def get_courses(self, **kwargs):
+    def invalidate_cache(self, page_id=None):
+        """
+        Drop cached query results, the on-disk snapshot, and the cached copy of
+        page_id if given. Called after writes so later reads see the change.
+        """
+        if page_id:
+            self._cache.invalidate(("page", page_id))
+        self._cache.invalidate_type("query")
+        try:
+            _snapshot_path(self.database_id).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _query_children(self, parent_ids):
+        """Return every page whose "Parent item" is one of parent_ids (one paginated query)."""
+        children_filter = {
+            "or": [{"property": "Parent item", "relation": {"contains": pid}} for pid in parent_ids]
+        }
+        return self._get_pages(retrieve_all=True, filter=children_filter)
+
+    def _fetch_tree(self, root_ids, root_pages=None):
+        """
+        Fetch the given pages and all of their descendants.
+
+        Roots not already supplied in root_pages (page_id -> page) are fetched
+        with get_page. Below that, the tree is walked level by level: the
+        children of a whole level are fetched with one database query per
+        MAX_FILTER_CONDITIONS parents (an "or" of "Parent item" filters), the
+        chunks running concurrently. Only pages with a non-empty "Sub-item"
+        relation are queried for children. Returns a dict of page_id -> raw
+        Notion page, with siblings in their parent's "Sub-item" order.
+        """
+        iter_relation_ids = _iter_relation_ids  # local alias for the per-page loop
+        root_ids = list(dict.fromkeys(root_ids))
+        visited_pages = dict(root_pages or {})
+        missing = [pid for pid in root_ids if pid not in visited_pages]
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as executor:
+            for page_id, page in zip(missing, executor.map(self._get_page, missing)):
+                visited_pages[page_id] = page
+            level = [visited_pages[pid] for pid in root_ids]
+            while level:
+                parents = [
+                    page["id"] for page in level
+                    if next(iter_relation_ids(page.get("properties", {}), "Sub-item"), None)
+                ]
+                chunks = [parents[i:i + MAX_FILTER_CONDITIONS] for i in range(0, len(parents), MAX_FILTER_CONDITIONS)]
+                new_pages = {}
+                for children in executor.map(self._query_children, chunks):
+                    for page in children:
+                        if page["id"] not in visited_pages:
+                            new_pages.setdefault(page["id"], page)
+                level = self._order_children(
+                    [visited_pages[pid] for pid in parents], new_pages.values()
+                )
+                for page in level:
+                    visited_pages[page["id"]] = page
+        return visited_pages
+
+    @staticmethod
+    def _order_children(parents, children):
+        """
+        Return children grouped by parent (in the order of parents) and, within a
+        parent, in the order of its "Sub-item" relation, as a page-by-page walk
+        of the relations would find them. build_hierarchy keeps the order pages
+        are passed in, so this is what keeps chapters and lessons in course
+        order. Children missing from a (truncated) "Sub-item" list follow in
+        query order.
+        """
+        by_parent = {page["id"]: [] for page in parents}
+        orphans = []
+        for page in children:
+            parent_id = next(_iter_relation_ids(page.get("properties", {}), "Parent item"), None)
+            by_parent.get(parent_id, orphans).append(page)
+
+        ordered = []
+        for parent in parents:
+            siblings = by_parent[parent["id"]]
+            position = {
+                child_id: i
+                for i, child_id in enumerate(_iter_relation_ids(parent.get("properties", {}), "Sub-item"))
+            }
+            # sort() is stable, so unlisted children keep their query order at the end.
+            siblings.sort(key=lambda page: position.get(page["id"], len(position)))
+            ordered.extend(siblings)
+        ordered.extend(orphans)
+        return ordered
+
+    def course_exists(self, name):
+        """
+        Return True if a top-level course page with the given name exists.
+
+        Issues a single filtered query (page_size=1) instead of fetching the
+        whole database; a course is a page with no "Parent item".
+        """
+        course_filter = {
+            "and": [
+                _name_condition(name),
+                {"property": "Parent item", "relation": {"is_empty": True}},
+            ]
+        }
+        return next(self._iter_pages(page_size=1, filter=course_filter), None) is not None
+
+    def existing_course_names(self, names):
+        """
+        Return the subset of names that already exist as top-level courses.
+
+        Uses one filtered query per MAX_FILTER_CONDITIONS names (an "or" of Name
+        conditions) instead of fetching the whole database, and stops reading a
+        chunk's results once every name in it has been seen.
+        """
+        names = [n for n in dict.fromkeys(names) if n]
+        found = set()
+        for start in range(0, len(names), MAX_FILTER_CONDITIONS):
+            chunk = names[start:start + MAX_FILTER_CONDITIONS]
+            course_filter = {
+                "and": [
+                    {"or": [_name_condition(n) for n in chunk]},
+                    {"property": "Parent item", "relation": {"is_empty": True}},
+                ]
+            }
+            pending = set(chunk)
+            for page in self._iter_pages(filter=course_filter):
+                pending.discard(_extract_title(page.get("properties", {})))
+                if not pending:
+                    break
+            found.update(set(chunk) - pending)
+        return found
+
+    def get_courses(self, name: str = None, name_filter: dict = None, refresh=False):
         """
         Fetch courses (and their chapters/lessons) from Notion and return a hierarchical
         nested object (instead of a DataFrame).
 
-        If no filter is provided, all pages are fetched.
-        If a filter is provided (e.g., Name="Sample Course"), only matching courses and
+        If no filter is provided, all pages are fetched (or read from the on-disk
+        snapshot, if enabled and fresh). refresh=True drops cached data first.
+        If name (e.g. "Sample Course") or name_filter (a complete query payload,
+        e.g. {"filter": {...}}, used verbatim) is given, only matching courses and
         their children are fetched recursively.
 
         Returns:
@@ -109,46 +497,33 @@ class NotionDB:
         properties_mapping = self.forward_mapping
         config = self.hierarchy_config
 
-        # Build filter payload if a "Name" filter is provided.
-        filter_payload = None
-        if "Name" in kwargs:
-            if isinstance(kwargs["Name"], dict):
-                filter_payload = kwargs["Name"]
-            else:
-                filter_payload = {
-                    "filter": {
-                        "property": "Name",
-                        "title": {"equals": kwargs["Name"]}
-                    }
-                }
+        if name_filter is not None:
+            filter_payload = name_filter
+        elif name:
+            filter_payload = {"filter": _name_condition(name)}
+        else:
+            filter_payload = None
+
+        if refresh:
+            self.invalidate_cache()
 
         if not filter_payload:
-            notion_data = self.notion.get_pages(retrieve_all=True)
+            notion_data = self._get_all_pages()
             if not notion_data:
                 return {config.get("root", "courses"): []}
             courses_hierarchy = self.notion.build_hierarchy(notion_data, config, properties_mapping)
             return courses_hierarchy
         else:
-            filtered_courses = self.notion.get_pages(**filter_payload)
+            filtered_courses = self._get_pages(**filter_payload)
             if not filtered_courses:
                 return {config.get("root", "courses"): []}
 
-            visited_pages = {}
-
-            def fetch_children(page_id):
-                if page_id in visited_pages:
-                    return
-                page = self.notion.get_page(page_id)
-                visited_pages[page_id] = page
-                sub_item_ids = self._extract_relation(page.get("properties", {}), "Sub-item")
-                for child_id in sub_item_ids:
-                    fetch_children(child_id)
-
-            for course_page in filtered_courses:
-                fetch_children(course_page["id"])
-
-            notion_data = list(visited_pages.values())
-            courses_hierarchy = self.notion.build_hierarchy(notion_data, config, properties_mapping)
+            visited_pages = self._fetch_tree(
+                [course_page["id"] for course_page in filtered_courses],
+                root_pages={course_page["id"]: course_page for course_page in filtered_courses}
+            )
+            # build_hierarchy walks the pages once, so the dict view is enough.
+            courses_hierarchy = self.notion.build_hierarchy(visited_pages.values(), config, properties_mapping)
             return courses_hierarchy
 
 
@@ -157,31 +532,141 @@ class NotionDB:
         Fetch a single course (by page_id), including its chapters and lessons,
         and return the hierarchical structure as a nested dictionary.
         """
-        visited_pages = {}
-
-        def fetch_children(page_id):
-            if page_id in visited_pages:
-                return
-            page = self.notion.get_page(page_id)
-            visited_pages[page_id] = page
-            sub_item_ids = self._extract_relation(page.get("properties", {}), "Sub-item")
-            for child_id in sub_item_ids:
-                fetch_children(child_id)
-
-        fetch_children(course_id)
-        notion_data = list(visited_pages.values())
+        visited_pages = self._fetch_tree([course_id])
 
         properties_mapping = self.forward_mapping
         config = self.hierarchy_config
 
-        courses_hierarchy = self.notion.build_hierarchy(notion_data, config, properties_mapping)
+        courses_hierarchy = self.notion.build_hierarchy(visited_pages.values(), config, properties_mapping)
         root_key = config.get("root", "courses")
         if courses_hierarchy and root_key in courses_hierarchy:
-            filtered = [course for course in courses_hierarchy[root_key] if course.get("id") == course_id]
-            return {root_key: filtered} if filtered else {}
+            # The fetched pages form a single subtree, so the course is its only
+            # root; next() stops at it instead of rebuilding the root list.
+            course = next((c for c in courses_hierarchy[root_key] if c.get("id") == course_id), None)
+            return {root_key: [course]} if course else {}
         return courses_hierarchy
 
 
+    def _prepare_payload(self, flat_object, back_mapping, parent_item=None, parent_icon=None, parent_cover=None):
+        """
+        Build the Notion create-page payload for a single flat object.
+
+        Resolves the parent id (and default icon/cover) from parent_item, builds
+        the payload via build_notion_payload() and attaches the "Parent item"
+        relation. flat_object itself is not modified. Returns (payload, parent_item_id).
+        """
+        # If parent_item is provided as a dict, extract its id, icon, and cover.
+        if isinstance(parent_item, dict):
+            parent_item_id = parent_item.get("id")
+        else:
+            # Otherwise assume it's a string (ID) or None.
+            parent_item_id = parent_item
+            parent_item = {}
+
+        # Resolve icon and cover: own value, then the parent's, then the default.
+        # They go into a shallow copy so the caller's flat_object is left untouched.
+        obj = {
+            **flat_object,
+            "icon": _first_set(flat_object.get("icon"), parent_icon, parent_item.get("icon"), DEFAULT_ICON_URL),
+            "cover": _first_set(flat_object.get("cover"), parent_cover, parent_item.get("cover"), DEFAULT_COVER_URL),
+        }
+
+        # Build payload using NotionManager's build_notion_payload().
+        payload = self.notion.build_notion_payload(obj, back_mapping)
+
+        # Append "Parent item" relation if a parent_item_id is available.
+        # (build_notion_payload() always fills in "properties".)
+        if parent_item_id:
+            payload["properties"]["Parent item"] = _parent_relation(parent_item_id)
+
+        return payload, parent_item_id
+
+    def _add_pages(self, prepared):
+        """
+        Create pages from (payload, parent_item_id) pairs, as returned by
+        _prepare_payload(). Returns the new pages in input order.
+
+        Siblings (pages sharing a parent) are created one after another in input
+        order, because Notion orders the parent's "Sub-item" relation by creation
+        and chapters/lessons must keep their course order. Different parents are
+        handled concurrently (at most MAX_CONCURRENT_WRITES in flight); pages of
+        a single parent are simply created in the calling thread.
+        """
+        groups = {}
+        for index, (payload, parent_item_id) in enumerate(prepared):
+            groups.setdefault(parent_item_id, []).append((index, payload))
+        if len(groups) <= 1:
+            return [self.notion.add_page(payload) for payload, _ in prepared]
+
+        def add_siblings(group):
+            return [(index, self.notion.add_page(payload)) for index, payload in group]
+
+        new_pages = [None] * len(prepared)
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_WRITES) as executor:
+            for created in executor.map(add_siblings, groups.values()):
+                for index, page in created:
+                    new_pages[index] = page
+        return new_pages
+
+    def insert_pages(self, flat_objects, back_mapping, forward_mapping, parent_item=None, parent_icon=None, parent_cover=None):
+        """
+        Insert several sibling pages (e.g. all lessons of one chapter) under the same
+        parent. The payloads are built up front, then the pages are created one
+        after another in order, so the parent's "Sub-item" relation matches
+        flat_objects (see _add_pages).
+
+        Only the objects themselves are inserted, not any nested children.
+        Returns the transformed pages in the same order as flat_objects.
+        """
+        if not flat_objects:
+            return []
+
+        prepared = [
+            self._prepare_payload(obj, back_mapping, parent_item, parent_icon, parent_cover)
+            for obj in flat_objects
+        ]
+        new_pages = self._add_pages(prepared)
+        # The parent's "Sub-item" relation and any cached query results are now stale.
+        self.invalidate_cache(prepared[0][1])
+        return [self.notion.transform_page(page, forward_mapping) for page in new_pages]
+
+    def insert_tree(self, flat_objects, back_mapping, forward_mapping, child_keys=(), parent_item=None):
+        """
+        Insert flat_objects and their nested children level by level, e.g.
+        child_keys=("chapters", "lessons") for a list of courses.
+
+        Each level is created once its parents exist. Within a level, the children
+        of different parents are created concurrently, while the siblings under
+        one parent are created in order (see _add_pages), so e.g. the lessons of
+        8 chapters are written as 8 parallel ordered runs. Each inserted object
+        gets its new Notion "id" set. Returns the transformed pages of the top level.
+        """
+        inserted_roots = []
+        level = [(obj, parent_item) for obj in flat_objects]
+        for depth in range(len(child_keys) + 1):
+            if not level:
+                break
+            prepared = [self._prepare_payload(obj, back_mapping, parent) for obj, parent in level]
+            new_pages = [
+                self.notion.transform_page(page, forward_mapping)
+                for page in self._add_pages(prepared)
+            ]
+            for parent_id in {parent_id for _, parent_id in prepared}:
+                self.invalidate_cache(parent_id)
+            if depth == 0:
+                inserted_roots = new_pages
+
+            next_level = []
+            for (obj, _), new_page in zip(level, new_pages):
+                obj["id"] = new_page.get("id")
+                if depth < len(child_keys):
+                    children = obj.get(child_keys[depth]) or []
+                    if isinstance(children, dict):
+                        children = [children]
+                    next_level.extend((child, new_page) for child in children)
+            level = next_level
+        return inserted_roots
+
     def insert_page(self, flat_object, back_mapping, forward_mapping, parent_item=None, parent_icon=None, parent_cover=None, child_key=None):
         """
         Insert a new page (e.g., a course, chapter, or lesson) into Notion.
@@ -197,17 +682,19 @@ class NotionDB:
           - child_key (str, optional): If provided, the key in flat_object that holds child pages (a dict or list) to insert recursively.
 
         Workflow:
-          1. If flat_object is a list, iterate over its items.
-          2. If parent_item is a dict, extract its "id", "icon", and "cover" as defaults.
-          3. Ensure "icon" and "cover" are present in flat_object.
-          4. Build the payload via NotionManager's build_notion_payload().
-          5. If a parent ID is available, append a "Parent item" relation.
+          1. If flat_object is a list, insert its items in order (via insert_pages when there is no child_key).
+          2-5. Build the payload via _prepare_payload() (parent id, icon/cover defaults,
+               build_notion_payload(), "Parent item" relation).
           6. Call notion.add_page(payload) and transform the returned page.
-          7. If child_key is provided and exists in flat_object, iterate over its items (or a single dict) recursively.
+          7. If child_key is provided and exists in flat_object, insert its items (or a single dict),
+             creating a list of children in order via insert_pages.
           8. Return the transformed page with nested children.
         """
-        # If flat_object is a list, iterate over each item.
+        # If flat_object is a list, iterate over each item (sibling pages without
+        # children of their own go through insert_pages).
         if isinstance(flat_object, list):
+            if not child_key:
+                return self.insert_pages(flat_object, back_mapping, forward_mapping, parent_item, parent_icon, parent_cover)
             inserted_list = []
             for item in flat_object:
                 inserted_item = self.insert_page(item, back_mapping, forward_mapping, parent_item, parent_icon, parent_cover, child_key)
@@ -215,42 +702,12 @@ class NotionDB:
             return inserted_list
 
         # flat_object is a dict.
-        # If parent_item is provided as a dict, extract its id, icon, and cover.
-        parent_item_id = None
-        if parent_item and isinstance(parent_item, dict):
-            parent_item_id = parent_item.get("id")
-            if not parent_icon:
-                parent_icon = parent_item.get("icon")
-            if not parent_cover:
-                parent_cover = parent_item.get("cover")
-        elif parent_item:
-            # If parent_item is not a dict, assume it's a string (ID).
-            parent_item_id = parent_item
-
-        # Ensure icon and cover in flat_object.
-        if not flat_object.get("icon"):
-            flat_object["icon"] = parent_icon if parent_icon else DEFAULT_ICON_URL
-        if not flat_object.get("cover"):
-            flat_object["cover"] = parent_cover if parent_cover else DEFAULT_COVER_URL
-
-        # Build payload using NotionManager's build_notion_payload().
-        payload = self.notion.build_notion_payload(flat_object, back_mapping)
-
-
-        # Append "Parent item" relation if a parent_item_id is available.
-        if parent_item_id:
-            parent_relation = {
-                "type": "relation",
-                "relation": [{"id": parent_item_id}],
-                "has_more": False
-            }
-            if "properties" not in payload:
-                payload["properties"] = {}
-            payload["properties"]["Parent item"] = parent_relation
-
+        payload, parent_item_id = self._prepare_payload(flat_object, back_mapping, parent_item, parent_icon, parent_cover)
 
         # Insert the page.
         new_page = self.notion.add_page(payload)
+        # The parent's "Sub-item" relation and any cached query results are now stale.
+        self.invalidate_cache(parent_item_id)
         # Transform the returned page.
         transformed_page = self.notion.transform_page(new_page, forward_mapping)
 
@@ -258,11 +715,8 @@ class NotionDB:
         if child_key and flat_object.get(child_key):
             children = flat_object[child_key]
             if isinstance(children, list):
-                inserted_children = []
-                for child in children:
-                    inserted_child = self.insert_page(child, back_mapping, forward_mapping, parent_item=transformed_page)
-                    inserted_children.append(inserted_child)
-                transformed_page[child_key] = inserted_children
+                # Siblings keep their order (see insert_pages).
+                transformed_page[child_key] = self.insert_pages(children, back_mapping, forward_mapping, parent_item=transformed_page)
             elif isinstance(children, dict):
                 transformed_page[child_key] = self.insert_page(children, back_mapping, forward_mapping, parent_item=transformed_page)
         return transformed_page
@@ -273,9 +727,10 @@ if __name__ == "__main__":
     import json
     from dotenv import load_dotenv
 
-    # Load environment variables from the .env file located in the same directory.
-    env_path = os.path.join(os.path.dirname(__file__), ".env")
-    load_dotenv(dotenv_path=env_path)
+    # Load environment variables from the .env file located in the same directory,
+    # unless incept.config already put the credentials in the environment.
+    if not os.getenv("NOTION_API_KEY"):
+        load_dotenv(dotenv_path=Path(__file__).with_name(".env"))
 
     # Retrieve credentials from environment variables.
     NOTION_API_KEY = os.getenv("NOTION_API_KEY")
@@ -296,13 +751,13 @@ if __name__ == "__main__":
 
     def test_insert_lessons(notion_db):
         # Assume the payload file is at $HOME/.incept/payload/lessons.json
-        payload_file = os.path.join(os.path.expanduser("~"), ".incept", "payload", "ml_test_payload.json")
-        if not os.path.exists(payload_file):
+        payload_file = Path.home() / ".incept" / "payload" / "ml_test_payload.json"
+        if not payload_file.is_file():
             print(f"Payload file not found: {payload_file}")
             return
 
-        with open(payload_file, "r") as f:
-            payload_data = json.load(f)
+        data = payload_file.read_bytes()
+        payload_data = orjson.loads(data) if orjson is not None else json.loads(data)
 
         # For testing, assume we want to insert lessons for the first course and first chapter.
         try:
@@ -7,6 +7,7 @@ import shutil
 import jinja2
 import datetime
 import copy
+from functools import lru_cache
 from pathlib import Path
 from platformdirs import user_documents_dir
 from typing import Optional, Any, Dict, List, Tuple
@@ -41,32 +42,41 @@ def get_default_documents_folder() -> Path:
     """
     return Path(user_documents_dir())
 
+# Patterns used by sanitize_dir_name, compiled once at import.
+_INVALID_CHARS_RE = re.compile(r"[^\w\s-]")
+_WHITESPACE_RE    = re.compile(r"\s+")
+_UNDERSCORES_RE   = re.compile(r"_+")
+
+@lru_cache(maxsize=4096)
 def sanitize_dir_name(name: str) -> str:
     """
     Converts 'Course Name 123!' → 'Course_Name_123'
     - Spaces & dashes are converted to underscores.
     - Special characters (except `_`) are removed.
     - Ensures only **one** underscore (`_`) between words.
+
+    Results are memoised; the function is pure and names repeat across
+    courses, chapters and template files.
     """
     # If there's a dot, assume it's a file with an extension.
     if '.' in name:
         base, ext = name.rsplit('.', 1)
         # Sanitize the base name.
-        base = re.sub(r"[^\w\s-]", "", base)
+        base = _INVALID_CHARS_RE.sub("", base)
         base = base.replace("-", "_")
-        base = re.sub(r"\s+", "_", base)
+        base = _WHITESPACE_RE.sub("_", base)
         # collapse runs of “__” but keep a single leading underscore
-        base = re.sub(r"_+", "_", base)
+        base = _UNDERSCORES_RE.sub("_", base)
         if not base.startswith("_"):          # allow _publish, _render, …
             base = base.strip("_")            # still trim trailing “_”
             # Return the sanitized base with the original extension.
         return f"{base}.{ext}"
     else:
         # Otherwise, sanitize normally.
-        name = re.sub(r"[^\w\s-]", "", name)
+        name = _INVALID_CHARS_RE.sub("", name)
         name = name.replace("-", "_")
-        name = re.sub(r"\s+", "_", name)
-        name = re.sub(r"_+", "_", name)
+        name = _WHITESPACE_RE.sub("_", name)
+        name = _UNDERSCORES_RE.sub("_", name)
         # keep a single leading underscore if present
         if name.startswith("_"):
             name = name.rstrip("_")      # only trim trailing underscores